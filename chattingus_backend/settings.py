@@ -53,6 +53,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "django.middleware.gzip.GZipMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -163,6 +165,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
@@ -254,6 +260,10 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(minute=0, hour=8, day_of_week='monday'), # 8 AM Monday
         'args': ('weekly',),
     },
+    'reconcile-unread-notification-counts-daily': {
+        'task': 'core.tasks.reconcile_unread_notification_counts',
+        'schedule': crontab(minute=0, hour=3), # 3 AM daily
+    },
     'auto-release-escrow-daily': {
         'task': 'core.tasks.auto_release_escrow',
         'schedule': crontab(minute=0, hour=2), # 2 AM daily
@@ -1,8 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser, Profile, Post, PostMedia, SMSDevice, Like, Comment, Hashtag, Follow, Notification, Block, Mute, FeedPost, Story, StoryView, StoryReaction, Highlight, HighlightItem, Category, Listing, AttributeDefinition, AttributeOption, ListingAttributeValue, ListingPromotion, SavedSearch, Conversation, Message, Offer, Report, Order, Dispute, DisputeMessage, Review, WishlistItem, SellerFollow, SubscriptionPlan, UserSubscription, Wallet, VirtualTransaction, Referral, Payout, DailyAggregate, FeatureFlag
-from .admin_site import custom_admin_site
+from .admin_site import custom_admin_site, reported_object_prefetch
 from django.contrib.admin.models import LogEntry
+from django.db.models.functions import Now
 from django.http import HttpResponse
 import csv
 import uuid
@@ -33,6 +34,10 @@ def export_as_csv(modeladmin, request, queryset):
 
 export_as_csv.short_description = "Export Selected as CSV"
 
+def bulk_set_status(queryset, status):
+    # One UPDATE for the whole selection; update() skips auto_now, so stamp updated_at in SQL
+    return queryset.update(status=status, updated_at=Now())
+
 class PostAdmin(admin.ModelAdmin):
     inlines = [PostMediaInline]
     list_display = ['user', 'caption', 'created_at']
@@ -81,6 +86,7 @@ class FollowAdmin(admin.ModelAdmin):
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ['recipient', 'sender', 'notification_type', 'is_read', 'created_at']
     list_filter = ['notification_type', 'is_read']
+    list_select_related = ['recipient', 'sender']
 
 custom_admin_site.register(Follow, FollowAdmin)
 custom_admin_site.register(Notification, NotificationAdmin)
@@ -209,14 +215,19 @@ class ReportAdmin(admin.ModelAdmin):
     search_fields = ['reporter__username', 'description']
     actions = ['mark_as_investigating', 'mark_as_resolved', 'mark_as_dismissed']
 
+    list_select_related = ['reporter']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(reported_object_prefetch())
+
     def mark_as_investigating(self, request, queryset):
-        queryset.update(status='investigating')
+        bulk_set_status(queryset, 'investigating')
     
     def mark_as_resolved(self, request, queryset):
-        queryset.update(status='resolved')
+        bulk_set_status(queryset, 'resolved')
 
     def mark_as_dismissed(self, request, queryset):
-        queryset.update(status='dismissed')
+        bulk_set_status(queryset, 'dismissed')
 
 custom_admin_site.register(Report, ReportAdmin)
 
@@ -298,13 +309,13 @@ class DisputeAdmin(admin.ModelAdmin):
     actions = ['mark_as_under_review', 'mark_as_resolved', 'mark_as_closed']
 
     def mark_as_under_review(self, request, queryset):
-        queryset.update(status='under_review')
+        bulk_set_status(queryset, 'under_review')
 
     def mark_as_resolved(self, request, queryset):
-        queryset.update(status='resolved')
+        bulk_set_status(queryset, 'resolved')
 
     def mark_as_closed(self, request, queryset):
-        queryset.update(status='closed')
+        bulk_set_status(queryset, 'closed')
 
 custom_admin_site.register(Dispute, DisputeAdmin)
 custom_admin_site.register(DisputeMessage)
@@ -10,13 +10,36 @@ import json
 from django.http import JsonResponse
 
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.contrib.admin.models import LogEntry
-from .models import Report, Payout, PushNotification, Webhook
+from .models import Report, Payout, PushNotification, Webhook, Post, Comment
 from django_celery_beat.models import PeriodicTask
 import csv
 import io
 import requests
 
+def reported_object_prefetch():
+    # Load reported objects with one query per content type, including what their __str__ touches
+    return GenericPrefetch('content_object', [
+        Post.objects.select_related('user'),
+        Comment.objects.select_related('user', 'post'),
+    ])
+
+# Simulated queue length for demo
+SIMULATED_QUEUE_INFO = {
+    'pending': 5,
+    'active': 2,
+    'failed': 1
+}
+
+# Report moderation actions and the status each one sets
+REPORT_ACTION_STATUSES = {
+    'resolve': 'resolved',
+    'dismiss': 'dismissed',
+    'investigate': 'investigating',
+    'escalate': 'escalated',
+}
+
 class CustomAdminSite(admin.AdminSite):
     site_header = "ChattingUS Administration"
     site_title = "ChattingUS Admin Portal"
@@ -125,18 +148,13 @@ class CustomAdminSite(admin.AdminSite):
             except PeriodicTask.DoesNotExist:
                 return JsonResponse({'status': 'error'}, status=404)
 
-        tasks = PeriodicTask.objects.all()
-        # Simulated queue length for demo
-        queue_info = {
-            'pending': 5,
-            'active': 2,
-            'failed': 1
-        }
+        # The template shows each task's schedule, so join it instead of fetching per row
+        tasks = PeriodicTask.objects.select_related('crontab', 'interval')
         context = {
             **self.each_context(request),
             'title': 'Background Jobs Monitor',
             'tasks': tasks,
-            'queue_info': queue_info,
+            'queue_info': SIMULATED_QUEUE_INFO,
         }
         return TemplateResponse(request, "admin/jobs_monitor.html", context)
 
@@ -146,28 +164,30 @@ class CustomAdminSite(admin.AdminSite):
             action = request.POST.get('action') # 'resolve', 'dismiss', 'investigate'
             try:
                 report = Report.objects.get(id=report_id)
-                if action == 'resolve':
-                    report.status = 'resolved'
-                elif action == 'dismiss':
-                    report.status = 'dismissed'
-                elif action == 'investigate':
-                    report.status = 'investigating'
-                elif action == 'escalate':
-                    report.status = 'escalated'
-                report.save()
+                new_status = REPORT_ACTION_STATUSES.get(action)
+                if new_status:
+                    report.status = new_status
+                report.save(update_fields=['status', 'updated_at'])
                 return JsonResponse({'status': 'success'})
             except Report.DoesNotExist:
                 return JsonResponse({'status': 'error', 'message': 'Report not found'}, status=404)
 
         # Group reports by target object
-        all_reports = Report.objects.filter(status__in=['pending', 'investigating', 'escalated']).order_by('-created_at')
+        all_reports = (
+            Report.objects.filter(status__in=['pending', 'investigating', 'escalated'])
+            .select_related('reporter')
+            .prefetch_related(reported_object_prefetch())
+            .order_by('-created_at')
+        )
         grouped_reports = {}
         for r in all_reports:
-            key = f"{r.content_type.model}_{r.object_id}"
+            # Resolved from ContentType's process-wide cache instead of a join per report
+            model_name = ContentType.objects.get_for_id(r.content_type_id).model
+            key = f"{model_name}_{r.object_id}"
             if key not in grouped_reports:
                 grouped_reports[key] = {
                     'target': r.content_object,
-                    'type': r.content_type.model,
+                    'type': model_name,
                     'reports': []
                 }
             grouped_reports[key]['reports'].append(r)
@@ -191,7 +211,7 @@ class CustomAdminSite(admin.AdminSite):
                     payout.status = 'processed'
                     payout.proof_of_payment = proof
                     payout.processed_at = timezone.now()
-                    payout.save()
+                    payout.save(update_fields=['status', 'proof_of_payment', 'processed_at'])
                 return JsonResponse({'status': 'success'})
             except Payout.DoesNotExist:
                 return JsonResponse({'status': 'error', 'message': 'Payout not found'}, status=404)
@@ -212,10 +232,10 @@ class CustomAdminSite(admin.AdminSite):
                 listing = Listing.objects.get(id=listing_id)
                 if action == 'approve':
                     listing.status = 'active'
-                    listing.save()
+                    listing.save(update_fields=['status', 'updated_at'])
                 elif action == 'reject':
                     listing.status = 'rejected'
-                    listing.save()
+                    listing.save(update_fields=['status', 'updated_at'])
                 return JsonResponse({'status': 'success'})
             except Listing.DoesNotExist:
                 return JsonResponse({'status': 'error', 'message': 'Listing not found'}, status=404)
@@ -233,24 +253,29 @@ class CustomAdminSite(admin.AdminSite):
         today = timezone.now().date()
         last_30_days = today - timedelta(days=30)
         
-        # Sales Graph Data (Last 30 Days)
-        aggregates = DailyAggregate.objects.filter(date__gte=last_30_days).order_by('date')
+        # Sales Graph Data (Last 30 Days); the charts only need plain tuples, not model instances
+        aggregates = list(
+            DailyAggregate.objects.filter(date__gte=last_30_days).order_by('date').values_list('date', 'revenue', 'new_users')
+        )
+        labels = [day.strftime('%Y-%m-%d') for day, _, _ in aggregates]
         sales_data = {
-            'labels': [a.date.strftime('%Y-%m-%d') for a in aggregates],
-            'values': [float(a.revenue) for a in aggregates]
+            'labels': labels,
+            'values': [float(revenue) for _, revenue, _ in aggregates]
         }
 
         # User Growth Data
         user_growth = {
-            'labels': [a.date.strftime('%Y-%m-%d') for a in aggregates],
-            'values': [a.new_users for a in aggregates]
+            'labels': labels,
+            'values': [new_users for _, _, new_users in aggregates]
         }
 
         # Listing Categories Donut
-        categories = Category.objects.annotate(listing_count=Count('listings')).filter(listing_count__gt=0)
+        categories = list(
+            Category.objects.annotate(listing_count=Count('listings')).filter(listing_count__gt=0).values_list('name', 'listing_count')
+        )
         category_data = {
-            'labels': [c.name for c in categories],
-            'values': [c.listing_count for c in categories]
+            'labels': [name for name, _ in categories],
+            'values': [listing_count for _, listing_count in categories]
         }
 
         # Quick Stats for Cards
@@ -298,9 +323,9 @@ class CustomAdminSite(admin.AdminSite):
     def import_export_view(self, request):
         if request.method == 'POST' and 'import_users' in request.FILES:
             csv_file = request.FILES['import_users']
-            decoded_file = csv_file.read().decode('utf-8')
-            io_string = io.StringIO(decoded_file)
-            reader = csv.DictReader(io_string)
+            # Decode rows as they are read instead of holding the raw, decoded and
+            # StringIO copies of the whole upload in memory at once
+            reader = csv.DictReader(io.TextIOWrapper(csv_file.file, encoding='utf-8', newline=''))
             count = 0
             for row in reader:
                 CustomUser.objects.get_or_create(
@@ -1,4 +1,4 @@
-import json
+import orjson
 from django.utils import timezone
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
@@ -66,7 +66,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
     # Receive message from WebSocket
     async def receive(self, text_data):
-        data = json.loads(text_data)
+        # Drop malformed frames instead of letting the decode error close the socket
+        try:
+            data = orjson.loads(text_data)
+        except orjson.JSONDecodeError:
+            return
+        if not isinstance(data, dict):
+            return
         message_type = data.get('type')
 
         if message_type == 'typing':
@@ -124,12 +130,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def chat_typing(self, event):
         # Only send to other participants (not yourself)
         if event['user_id'] != self.user.id:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=orjson.dumps({
                 'type': 'typing',
                 'user_id': event['user_id'],
                 'username': event['username'],
                 'is_typing': event['is_typing']
-            }))
+            }).decode())
 
     # Receive chat message from room group
     async def chat_message(self, event):
@@ -141,30 +147,30 @@ class ChatConsumer(AsyncWebsocketConsumer):
             message_data['is_read'] = True
 
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=orjson.dumps({
             'type': 'message',
             'message': message_data
-        }))
+        }).decode())
 
     # Receive reaction from room group
     async def chat_reaction(self, event):
-        await self.send(text_data=json.dumps({
+        await self.send(text_data=orjson.dumps({
             'type': 'reaction',
             'reaction': event['reaction'],
             'message_id': event['message_id'],
             'action': event['action']
-        }))
+        }).decode())
 
     # Receive user status change from room group
     async def user_status(self, event):
         if event['user_id'] != self.user.id:
-            await self.send(text_data=json.dumps({
+            await self.send(text_data=orjson.dumps({
                 'type': 'user_status',
                 'user_id': event['user_id'],
                 'username': event['username'],
                 'is_online': event['is_online'],
                 'last_seen': event.get('last_seen')
-            }))
+            }).decode())
 
     @database_sync_to_async
     def is_participant(self, user, conversation_id):
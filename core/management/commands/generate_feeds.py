@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from core.models import Post, Follow, FeedPost, Block
 from django.db.models import Q
 from django.utils import timezone
+from collections import defaultdict
 
 User = get_user_model()
 
@@ -10,32 +11,37 @@ class Command(BaseCommand):
     help = 'Pre-compute feeds for all active users'
 
     def handle(self, *args, **options):
-        users = User.objects.all()
+        # Stream users in chunks; only the id is needed to build each feed
+        users = User.objects.only('id').iterator(chunk_size=1000)
         processed_count = 0
         
+        # Load the follow and block graphs once instead of three queries per user
+        following_map = defaultdict(set)
+        for follower_id, followed_id in Follow.objects.filter(status='accepted').values_list('follower_id', 'followed_id'):
+            following_map[follower_id].add(followed_id)
+        
+        blocked_map = defaultdict(set)
+        for user_id, blocked_user_id in Block.objects.values_list('user_id', 'blocked_user_id'):
+            # Either direction of a block hides posts
+            blocked_map[user_id].add(blocked_user_id)
+            blocked_map[blocked_user_id].add(user_id)
+        
         for user in users:
             # 1. Get posts from followed accounts
-            following_ids = Follow.objects.filter(
-                follower=user, 
-                status='accepted'
-            ).values_list('followed_id', flat=True)
+            following_ids = following_map[user.id]
             
             followed_posts = Post.objects.filter(user_id__in=following_ids)
             
             # 2. Suggested posts (popular tags or just recent ones from public accounts)
             # For simplicity, getting recent posts not from current user/already filtered
             # excluding blocks
-            blocked_users = Block.objects.filter(user=user).values_list('blocked_user_id', flat=True)
-            blocked_by_users = Block.objects.filter(blocked_user=user).values_list('user_id', flat=True)
-            
             exclude_ids = set(following_ids)
             exclude_ids.add(user.id)
-            exclude_ids.update(blocked_users)
-            exclude_ids.update(blocked_by_users)
+            exclude_ids.update(blocked_map[user.id])
             
             suggested_posts = Post.objects.exclude(
                 user_id__in=exclude_ids
-            ).filter(user__is_private=False).order_by('-created_at')[:20]
+            ).filter(user__is_private=False).order_by('-created_at').values_list('id', flat=True)[:20]
             
             # 3. Combine and refresh feed
             # Clear existing feed for the user
@@ -45,12 +51,12 @@ class Command(BaseCommand):
             feed_entries = []
             
             # Add followed posts
-            for post in followed_posts.order_by('-created_at')[:100]:
-                feed_entries.append(FeedPost(user=user, post=post, source='following'))
+            for post_id in followed_posts.order_by('-created_at').values_list('id', flat=True)[:100]:
+                feed_entries.append(FeedPost(user=user, post_id=post_id, source='following'))
                 
             # Add suggested posts
-            for post in suggested_posts:
-                feed_entries.append(FeedPost(user=user, post=post, source='suggested'))
+            for post_id in suggested_posts:
+                feed_entries.append(FeedPost(user=user, post_id=post_id, source='suggested'))
             
             FeedPost.objects.bulk_create(feed_entries, ignore_conflicts=True)
             processed_count += 1
@@ -3,7 +3,9 @@ import random
 from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
+from django.db import transaction
 from core.models import (
     Profile, Category, Listing, ListingMedia, Post, PostMedia, 
     SubscriptionPlan, Wallet, Follow, Conversation, Message, 
@@ -16,6 +18,8 @@ User = get_user_model()
 class Command(BaseCommand):
     help = 'Populate database with extensive dummy data across all systems'
 
+    # One transaction for the whole seed instead of a commit per INSERT
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         self.stdout.write("🏗️  Building high-fidelity dummy ecosystem...")
 
@@ -35,10 +39,10 @@ class Command(BaseCommand):
         users = {}
         credentials = []
         for uname, email, pwd, staff in users_data:
-            user, created = User.objects.get_or_create(username=uname, defaults={'email': email, 'is_staff': staff, 'is_superuser': staff})
-            if created:
-                user.set_password(pwd)
-                user.save()
+            # Hash the password up front so a new user is a single INSERT rather than INSERT + UPDATE
+            user, created = User.objects.get_or_create(username=uname, defaults={
+                'email': email, 'is_staff': staff, 'is_superuser': staff, 'password': make_password(pwd)
+            })
             users[uname] = user
             credentials.append(f"User: {uname} | Pass: {pwd}")
             
@@ -49,7 +53,11 @@ class Command(BaseCommand):
             p.save()
 
         # --- 4. SOCIAL ---
-        Follow.objects.get_or_create(follower=users['alex'], followed=users['admin'], status='accepted')
+        # INSERT ... ON CONFLICT DO NOTHING on (follower, followed): no SELECT first, and safe to re-run
+        Follow.objects.bulk_create(
+            [Follow(follower=users['alex'], followed=users['admin'], status='accepted')],
+            ignore_conflicts=True
+        )
         
         post = Post.objects.create(user=users['admin'], caption="Hello World! #testing")
         PostMedia.objects.create(post=post, file='posts/post_lifestyle.png', media_type='image')
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0038_pushnotification_payout_processed_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["status", "-created_at"], name="core_report_status_2f6592_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="core_report_content_93408d_idx",
+            ),
+        ),
+    ]
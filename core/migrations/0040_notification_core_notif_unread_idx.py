@@ -0,0 +1,21 @@
+# Generated by Django 5.2.11 on 2026-10-16 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0039_report_core_report_status_2f6592_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["recipient"],
+                name="core_notif_unread_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-16 10:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0040_notification_core_notif_unread_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["recipient", "-created_at"],
+                name="core_notifi_recipie_4d7e73_idx",
+            ),
+        ),
+    ]
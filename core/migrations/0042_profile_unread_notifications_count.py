@@ -0,0 +1,36 @@
+# Generated by Django 5.2.11 on 2026-10-16 11:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_notifications_count(apps, schema_editor):
+    Notification = apps.get_model("core", "Notification")
+    Profile = apps.get_model("core", "Profile")
+    unread = (
+        Notification.objects.filter(recipient_id=OuterRef("user_id"), is_read=False)
+        .order_by()
+        .values("recipient_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Profile.objects.update(unread_notifications_count=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0041_notification_core_notifi_recipie_4d7e73_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="unread_notifications_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_unread_notifications_count, migrations.RunPython.noop
+        ),
+    ]
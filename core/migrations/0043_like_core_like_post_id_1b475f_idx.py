@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-16 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0042_profile_unread_notifications_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="like",
+            index=models.Index(
+                fields=["post", "reaction_type"], name="core_like_post_id_1b475f_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-16 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0043_like_core_like_post_id_1b475f_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "-created_at"], name="core_commen_post_id_7e3d35_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-16 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0044_comment_core_commen_post_id_7e3d35_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="unread_notifications_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
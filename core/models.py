@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, F
+from django.db.models.functions import Greatest
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import AbstractUser
@@ -9,6 +11,7 @@ import uuid
 import os
 from django.utils import timezone
 from django.core.files.base import ContentFile
+from django.core.cache import cache
 
 class CustomUser(AbstractUser):
     GENDER_CHOICES = [
@@ -33,7 +36,6 @@ class CustomUser(AbstractUser):
         return self.username
 
     def get_seller_ratings(self):
-        from django.db.models import Avg
         return self.reviews_received.aggregate(
             avg_rating=Avg('rating'),
             avg_item=Avg('item_as_described'),
@@ -55,10 +57,20 @@ class Profile(models.Model):
     referral_code = models.CharField(max_length=20, unique=True, blank=True, null=True)
     referred_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='referrals_made')
     dashboard_layout = models.JSONField(default=dict, blank=True)
+    # Denormalised badge counter; only moved via adjust_unread_notifications and the reconcile task
+    unread_notifications_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
+    @classmethod
+    def adjust_unread_notifications(cls, user_ids, delta):
+        # Move the denormalised badge counter in the database, never below zero
+        if delta:
+            cls.objects.filter(user_id__in=user_ids).update(
+                unread_notifications_count=Greatest(F('unread_notifications_count') + delta, 0)
+            )
+
 import uuid
 from django.utils import timezone
 
@@ -153,6 +165,10 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('user', 'post')
+        # The unique index leads with user; reaction counts group per post
+        indexes = [
+            models.Index(fields=['post', 'reaction_type']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} reacted {self.reaction_type} to Post {self.post.id}"
@@ -167,6 +183,12 @@ class Comment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     hashtags = models.ManyToManyField('Hashtag', blank=True, related_name='comments')
 
+    class Meta:
+        # A post's comments are always read newest first
+        indexes = [
+            models.Index(fields=['post', '-created_at']),
+        ]
+
     def __str__(self):
         return f"Comment by {self.user.username} on Post {self.post.id}"
 
@@ -216,10 +238,29 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['recipient'],
+                condition=models.Q(is_read=False),
+                name='core_notif_unread_idx'
+            ),
+            models.Index(fields=['recipient', '-created_at']),
+        ]
 
     def __str__(self):
         return f"Notification for {self.recipient.username} from {self.sender.username}"
 
+    @staticmethod
+    def unread_count_cache_key(user_id):
+        return f"notif:unread:{user_id}"
+
+    @classmethod
+    def invalidate_unread_counts(cls, user_ids):
+        # Drop the cached badges only after commit, so a concurrent read cannot re-cache the old count
+        keys = [cls.unread_count_cache_key(user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
 class NotificationSetting(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='notification_settings')
     type = models.CharField(max_length=30) # matches Notification types or general groups
@@ -406,26 +447,42 @@ class Listing(models.Model):
         is_new = not self.id
         super().save(*args, **kwargs)
         
-        # Update search vector
-        try:
-            Listing.objects.filter(pk=self.pk).update(
-                search_vector=SearchVector('title', 'description', config='english')
-            )
-        except:
-            pass
+        # Update search vector, unless this was a partial save that left the text alone
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'title', 'description'} & set(update_fields):
+            try:
+                Listing.objects.filter(pk=self.pk).update(
+                    search_vector=SearchVector('title', 'description', config='english')
+                )
+            except:
+                pass
 
         if is_new and self.status == 'active':
             self.notify_followers()
 
     def notify_followers(self):
-        followers = SellerFollow.objects.filter(seller=self.user)
-        for follow in followers:
-            Notification.objects.create(
-                recipient=follow.user,
-                sender=self.user,
+        # One multi-row INSERT for the whole fan-out instead of a query per follower.
+        # Followers who muted in-app new-listing alerts are dropped in the same query.
+        muted_ids = NotificationSetting.objects.filter(
+            type='new_listing',
+            in_app_enabled=False
+        ).values('user_id')
+        follower_ids = SellerFollow.objects.filter(
+            seller_id=self.user_id
+        ).exclude(user_id__in=muted_ids).values_list('user_id', flat=True)
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient_id=follower_id,
+                sender_id=self.user_id,
                 notification_type='new_listing',
                 listing=self
             )
+            for follower_id in follower_ids
+        ], batch_size=1000)
+        # bulk_create skips post_save, so bump the followers' counters and drop their cached badges here
+        recipient_ids = [n.recipient_id for n in notifications]
+        Profile.adjust_unread_notifications(recipient_ids, 1)
+        Notification.invalidate_unread_counts(recipient_ids)
 
     def __str__(self):
         return self.title
@@ -603,6 +660,12 @@ class Report(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
     def __str__(self):
         return f"Report by {self.reporter.username} - {self.reason} ({self.status})"
 
@@ -854,6 +917,9 @@ from django.dispatch import receiver
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
+# Automated Flagging Logic
+INAPPROPRIATE_WORDS = ('scam', 'fraud', 'fake', 'spam', 'explicit', 'illegal') # Example list
+
 @receiver(post_save, sender=Order)
 @receiver(post_save, sender=CustomUser)
 @receiver(post_save, sender=Listing)
@@ -861,8 +927,6 @@ from channels.layers import get_channel_layer
 def notify_admin_dashboard(sender, instance, created, **kwargs):
     channel_layer = get_channel_layer()
     
-    # Automated Flagging Logic
-    INAPPROPRIATE_WORDS = ['scam', 'fraud', 'fake', 'spam', 'explicit', 'illegal'] # Example list
     is_flagged = False
     
     if sender == Listing:
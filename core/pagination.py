@@ -0,0 +1,8 @@
+from rest_framework.pagination import CursorPagination
+
+class CommentCursorPagination(CursorPagination):
+    # Seeks on created_at instead of OFFSET, so deep pages cost the same as the first
+    page_size = 20
+    ordering = '-created_at'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,16 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+class ORJSONRenderer(JSONRenderer):
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        # Types orjson can't encode natively (Decimal, lazy strings, querysets) fall back to DRF's encoder
+        return orjson.dumps(data, default=self.encoder_class().default, option=options)
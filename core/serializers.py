@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.db.models import Avg, Count, Prefetch
 from .models import Profile
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -22,14 +24,27 @@ class UserSerializer(serializers.ModelSerializer):
                   'date_of_birth', 'gender', 'website', 'is_private', 'is_verified', 
                   'profile', 'followers_count', 'following_count', 'seller_ratings']
 
+    def get_user_stats(self, obj):
+        # The same user is often serialized many times in one response (e.g. as the
+        # sender of a page of notifications), so compute their stats once per request
+        user_stats = self.context.setdefault('user_stats', {})
+        stats = user_stats.get(obj.pk)
+        if stats is None:
+            stats = user_stats[obj.pk] = {
+                'followers_count': obj.followers.filter(status='accepted').count(),
+                'following_count': obj.following.filter(status='accepted').count(),
+                'seller_ratings': obj.get_seller_ratings(),
+            }
+        return stats
+
     def get_followers_count(self, obj):
-        return obj.followers.filter(status='accepted').count()
+        return self.get_user_stats(obj)['followers_count']
 
     def get_following_count(self, obj):
-        return obj.following.filter(status='accepted').count()
+        return self.get_user_stats(obj)['following_count']
 
     def get_seller_ratings(self, obj):
-        return obj.get_seller_ratings()
+        return self.get_user_stats(obj)['seller_ratings']
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -51,7 +66,7 @@ class RegisterSerializer(serializers.ModelSerializer):
                 referrer_profile = Profile.objects.get(referral_code=referral_code)
                 profile = user.profile
                 profile.referred_by = referrer_profile.user
-                profile.save()
+                profile.save(update_fields=['referred_by'])
                 Referral.objects.get_or_create(
                     referrer=referrer_profile.user,
                     referred_user=user
@@ -105,8 +120,10 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
     def get_replies(self, obj):
-        if obj.replies.exists():
-            return CommentSerializer(obj.replies.all(), many=True).data
+        # Reads the prefetched replies when present; the shared context keeps author stats memoized
+        replies = obj.replies.all()
+        if replies:
+            return CommentSerializer(replies, many=True, context=self.context).data
         return []
 
 class PostMediaSerializer(serializers.ModelSerializer):
@@ -128,13 +145,18 @@ class PostSerializer(TaggitSerializer, serializers.ModelSerializer):
         fields = ['id', 'user', 'caption', 'location', 'mentions', 'tags', 'hashtags', 'media', 
                   'likes_count', 'reactions_counts', 'comments_count', 'created_at', 'updated_at']
 
+    def get_reaction_counts(self, obj):
+        # likes_count and reactions_counts share one GROUP BY per post instead of two queries
+        if not hasattr(obj, '_reaction_counts'):
+            reactions = obj.likes.values('reaction_type').annotate(count=Count('reaction_type'))
+            obj._reaction_counts = {r['reaction_type']: r['count'] for r in reactions}
+        return obj._reaction_counts
+
     def get_likes_count(self, obj):
-        return obj.likes.count()
+        return sum(self.get_reaction_counts(obj).values())
 
     def get_reactions_counts(self, obj):
-        from django.db.models import Count
-        reactions = obj.likes.values('reaction_type').annotate(count=Count('reaction_type'))
-        return {r['reaction_type']: r['count'] for r in reactions}
+        return self.get_reaction_counts(obj)
 
     def get_comments_count(self, obj):
         return obj.comments.count()
@@ -149,6 +171,49 @@ class FollowSerializer(serializers.ModelSerializer):
         model = Follow
         fields = ['id', 'follower', 'followed', 'status', 'created_at']
 
+def prime_user_stats(context, user_ids):
+    # Fill UserSerializer's per-request stats memo for many users with three grouped
+    # queries, rather than three queries per user as each one is serialized
+    user_stats = context.setdefault('user_stats', {})
+    user_ids = [user_id for user_id in set(user_ids) if user_id not in user_stats]
+    if not user_ids:
+        return
+
+    followers = dict(
+        Follow.objects.filter(followed_id__in=user_ids, status='accepted')
+        .order_by().values('followed_id').annotate(count=Count('id'))
+        .values_list('followed_id', 'count')
+    )
+    following = dict(
+        Follow.objects.filter(follower_id__in=user_ids, status='accepted')
+        .order_by().values('follower_id').annotate(count=Count('id'))
+        .values_list('follower_id', 'count')
+    )
+    ratings = {
+        r.pop('reviewee_id'): r
+        for r in Review.objects.filter(reviewee_id__in=user_ids)
+        .order_by().values('reviewee_id').annotate(
+            avg_rating=Avg('rating'),
+            avg_item=Avg('item_as_described'),
+            avg_communication=Avg('communication'),
+            avg_shipping=Avg('shipping_speed')
+        )
+    }
+    no_ratings = {'avg_rating': None, 'avg_item': None, 'avg_communication': None, 'avg_shipping': None}
+
+    for user_id in user_ids:
+        user_stats[user_id] = {
+            'followers_count': followers.get(user_id, 0),
+            'following_count': following.get(user_id, 0),
+            'seller_ratings': ratings.get(user_id, dict(no_ratings)),
+        }
+
+class NotificationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        notifications = list(data.all() if hasattr(data, 'all') else data)
+        prime_user_stats(self.context, [n.sender_id for n in notifications])
+        return super().to_representation(notifications)
+
 class NotificationSerializer(serializers.ModelSerializer):
     sender = UserSerializer(read_only=True)
     
@@ -156,6 +221,7 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = ['id', 'recipient', 'sender', 'notification_type', 'post', 'comment', 'is_read', 'created_at']
         read_only_fields = ['recipient', 'sender']
+        list_serializer_class = NotificationListSerializer
 
 class NotificationSettingSerializer(serializers.ModelSerializer):
     class Meta:
@@ -213,6 +279,8 @@ class StorySerializer(serializers.ModelSerializer):
         return obj.views.count()
 
     def get_is_viewed(self, obj):
+        if hasattr(obj, 'is_viewed'):
+            return obj.is_viewed
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.views.filter(user=request.user).exists()
@@ -222,6 +290,8 @@ class StorySerializer(serializers.ModelSerializer):
         return obj.reactions.count()
 
     def get_user_reaction(self, obj):
+        if hasattr(obj, 'user_reaction'):
+            return obj.user_reaction
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             reaction = obj.reactions.filter(user=request.user).first()
@@ -316,7 +386,10 @@ class ListingSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'rejected_reason', 'expires_at']
 
     def get_active_promotions(self, obj):
-        now = timezone.now()
+        # Read the clock once per response, shared by every listing in a list
+        now = self.context.get('now')
+        if now is None:
+            now = self.context['now'] = timezone.now()
         active = obj.promotions.filter(is_active=True, start_date__lte=now, end_date__gte=now)
         return ListingPromotionSerializer(active, many=True).data
 
@@ -369,10 +442,12 @@ class MessageSerializer(serializers.ModelSerializer):
         user = request.user if request and request.user.is_authenticated else None
         
         if user:
+            # Compare raw ids so no sender row is needed to decide visibility
+            is_own = instance.sender_id == user.id
             is_deleted = False
-            if instance.sender == user and instance.deleted_for_sender:
+            if is_own and instance.deleted_for_sender:
                 is_deleted = True
-            elif instance.sender != user and instance.deleted_for_receiver:
+            elif not is_own and instance.deleted_for_receiver:
                 is_deleted = True
             
             if is_deleted:
@@ -390,9 +465,16 @@ class ConversationSerializer(serializers.ModelSerializer):
         fields = ['id', 'participants', 'admins', 'name', 'type', 'latest_message', 'created_at', 'updated_at']
 
     def get_latest_message(self, obj):
-        message = obj.messages.last()
+        if hasattr(obj, 'latest_messages'):
+            # Prefetched by ConversationViewSet, at most one row per conversation
+            message = obj.latest_messages[0] if obj.latest_messages else None
+        else:
+            message = obj.messages.select_related('sender__profile').prefetch_related(
+                Prefetch('reactions', queryset=MessageReaction.objects.select_related('user__profile'))
+            ).order_by('-created_at', '-id').first()
         if message:
-            return MessageSerializer(message).data
+            # Share the request context so sender stats are memoized across the page
+            return MessageSerializer(message, context=self.context).data
         return None
 
 class OfferSerializer(serializers.ModelSerializer):
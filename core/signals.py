@@ -3,24 +3,24 @@ from django.dispatch import receiver
 from decimal import Decimal
 from .models import CustomUser, Profile, UserEmailVerification, PostMedia, Post, Comment, Hashtag, Notification, Wallet, Referral, Order, Payout, Listing, Webhook
 from .utils import send_verification_email, generate_video_thumbnail, extract_hashtags, extract_mentions, send_notification
-from .tasks import process_post_media
+from .tasks import process_post_media, deliver_webhook
 import uuid
-import requests
 import json
+from functools import partial
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
 def trigger_webhooks(event_name, data):
-    hooks = Webhook.objects.filter(event=event_name, is_active=True)
-    for hook in hooks:
-        try:
-            # In production, this should be a Celery task
-            requests.post(hook.url, json={
-                'event': event_name,
-                'data': data,
-                'timestamp': uuid.uuid4().hex # Using uuid for idempotency/request id
-            }, timeout=3)
-        except:
-            pass
+    payload = {
+        'event': event_name,
+        'data': data,
+        'timestamp': uuid.uuid4().hex # Using uuid for idempotency/request id
+    }
+    urls = Webhook.objects.filter(event=event_name, is_active=True).values_list('url', flat=True)
+    for url in urls:
+        # Deliver from a worker once the triggering row is committed
+        transaction.on_commit(partial(deliver_webhook.delay, url, payload))
 
 @receiver(post_save, sender=CustomUser)
 def create_user_related_models(sender, instance, created, **kwargs):
@@ -33,24 +33,32 @@ def create_user_related_models(sender, instance, created, **kwargs):
         UserEmailVerification.objects.create(user=instance)
         send_verification_email(instance)
         trigger_webhooks('user.registered', {'id': instance.id, 'username': instance.username})
+    else:
+        # User saves (e.g. last_login on every token issue) mark activity; touch only that column
+        Profile.objects.filter(user=instance).update(last_active=timezone.now())
 
 @receiver(post_save, sender=Listing)
 def trigger_listing_webhook(sender, instance, created, **kwargs):
     if created:
         trigger_webhooks('listing.created', {'id': instance.id, 'title': instance.title, 'price': str(instance.price)})
 
-@receiver(post_save, sender=CustomUser)
-def save_user_related_models(sender, instance, **kwargs):
-    instance.profile.save()
-    if hasattr(instance, 'email_verification'):
-        instance.email_verification.save()
+@receiver(post_save, sender=Notification)
+def update_unread_notification_count(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        Profile.adjust_unread_notifications([instance.recipient_id], 1)
+    Notification.invalidate_unread_counts([instance.recipient_id])
 
 @receiver(post_save, sender=PostMedia)
 def create_post_media_thumbnail(sender, instance, created, **kwargs):
-    if created and instance.media_type == 'video' and not instance.thumbnail:
+    if not created or instance.thumbnail:
+        return
+    
+    if instance.media_type == 'video':
         generate_video_thumbnail(instance)
-    elif created and instance.media_type == 'image' and not instance.thumbnail:
-        process_post_media.delay(instance.id)
+    elif instance.media_type == 'image':
+        # Queue only once the row is committed so the worker can see it
+        media_id = instance.id
+        transaction.on_commit(lambda: process_post_media.delay(media_id))
 
 def handle_hashtags(instance, text):
     tags = extract_hashtags(text)
@@ -60,50 +68,54 @@ def handle_hashtags(instance, text):
     to_add = new_tags - current_tags
     to_remove = current_tags - new_tags
 
-    for tag_name in to_remove:
-        tag = Hashtag.objects.filter(name=tag_name).first()
-        if tag:
-            instance.hashtags.remove(tag)
-            tag.count = max(0, tag.count - 1)
-            tag.save()
+    # Counters move with F() in one UPDATE per direction, so concurrent posts
+    # using the same tag cannot overwrite each other's increments
+    if to_remove:
+        removed_ids = list(Hashtag.objects.filter(name__in=to_remove).values_list('id', flat=True))
+        instance.hashtags.remove(*removed_ids)
+        Hashtag.objects.filter(id__in=removed_ids, count__gt=0).update(count=F('count') - 1)
 
-    for tag_name in to_add:
-        tag, created = Hashtag.objects.get_or_create(name=tag_name)
-        instance.hashtags.add(tag)
-        if not created:
-            tag.count += 1
-            tag.save()
-        else:
-            tag.count = 1
-            tag.save()
+    if to_add:
+        Hashtag.objects.bulk_create([Hashtag(name=tag_name) for tag_name in to_add], ignore_conflicts=True)
+        added_ids = list(Hashtag.objects.filter(name__in=to_add).values_list('id', flat=True))
+        instance.hashtags.add(*added_ids)
+        Hashtag.objects.filter(id__in=added_ids).update(count=F('count') + 1)
 
 def handle_mentions(instance, text):
     mentioned_usernames = extract_mentions(text)
     if not mentioned_usernames:
         return
 
-    # Find users
-    mentioned_users = CustomUser.objects.filter(username__in=mentioned_usernames)
+    # Find users; only the id is needed for the M2M rows and notification FKs
+    mentioned_users = CustomUser.objects.filter(username__in=mentioned_usernames).only('id', 'username')
     
     # Update M2M
     instance.mentions.set(mentioned_users)
     
-    # Create notifications
+    # Create notifications; the fields shared by every recipient are built once
     sender = instance.user
-    for mentioned_user in mentioned_users:
-        if mentioned_user != sender:
-            kwargs = {
-                'recipient': mentioned_user,
-                'sender': sender,
-                'notification_type': 'mention',
-            }
-            if isinstance(instance, Post):
-                kwargs['post'] = instance
-            else:
-                kwargs['comment'] = instance
-                kwargs['post'] = instance.post
-            
-            Notification.objects.get_or_create(**kwargs)
+    base_kwargs = {'sender': sender, 'notification_type': 'mention'}
+    if isinstance(instance, Post):
+        base_kwargs['post'] = instance
+    else:
+        base_kwargs['comment'] = instance
+        base_kwargs['post'] = instance.post
+    
+    # One lookup for already-notified users and one INSERT for the rest, instead of a get_or_create each
+    recipient_ids = {user.id for user in mentioned_users} - {sender.id}
+    if not recipient_ids:
+        return
+    recipient_ids -= set(Notification.objects.filter(
+        **base_kwargs, recipient_id__in=recipient_ids
+    ).values_list('recipient_id', flat=True))
+    notifications = Notification.objects.bulk_create(
+        [Notification(**base_kwargs, recipient_id=recipient_id) for recipient_id in recipient_ids],
+        batch_size=500
+    )
+    # bulk_create skips post_save, so bump the counters and drop the cached badges here
+    recipient_ids = [n.recipient_id for n in notifications]
+    Profile.adjust_unread_notifications(recipient_ids, 1)
+    Notification.invalidate_unread_counts(recipient_ids)
 
 @receiver(post_save, sender=Post)
 def process_post_content(sender, instance, **kwargs):
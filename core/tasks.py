@@ -1,20 +1,34 @@
 from celery import shared_task
 from django.utils import timezone
-from django.db.models import Q, Sum
+from django.db.models import Q, Sum, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.mail import send_mail
 from django.conf import settings
-from PIL import Image
+from PIL import Image, ImageOps
 from django import forms
 import os
 from io import BytesIO
-from django.core.files.base import ContentFile
-from .models import Story, Listing, SavedSearch, Notification, DailyAggregate, Post, CustomUser, Order, PostMedia
+from django.core.files.base import File
+import requests
+from .models import Story, Listing, SavedSearch, Notification, DailyAggregate, Post, CustomUser, Order, PostMedia, Profile
+
+STORY_DELETE_BATCH_SIZE = 1000
 
 @shared_task
 def delete_expired_stories():
-    expired_stories = Story.objects.filter(expires_at__lte=timezone.now())
-    count = expired_stories.count()
-    expired_stories.delete()
+    # Delete in bounded batches so no single DELETE (and its cascades to views,
+    # reactions and highlight items) holds row locks for long
+    now = timezone.now()
+    count = 0
+    while True:
+        batch = list(
+            Story.objects.filter(expires_at__lte=now)
+            .values_list('id', flat=True)[:STORY_DELETE_BATCH_SIZE]
+        )
+        if not batch:
+            break
+        _, deleted = Story.objects.filter(id__in=batch).delete()
+        count += deleted.get(Story._meta.label, 0)
     return f"Deleted {count} expired stories"
 
 @shared_task
@@ -29,14 +43,19 @@ def check_expired_listings():
 
 @shared_task
 def process_saved_searches():
+    # One timestamp for the whole run so no listing falls between two checks
+    now = timezone.now()
     searches = SavedSearch.objects.all()
+    processed = 0
     notifications_sent = 0
     
     for ss in searches:
-        # Find active listings created after last check
+        processed += 1
+        # Find active listings created since the last check, up to this run's timestamp
         queryset = Listing.objects.filter(
             status='active', 
-            created_at__gt=ss.last_checked_at
+            created_at__gt=ss.last_checked_at,
+            created_at__lte=now
         )
         
         # Apply keyword search
@@ -62,10 +81,9 @@ def process_saved_searches():
 
         # Notify if new listings found
         if queryset.exists():
-            count = queryset.count()
             Notification.objects.create(
-                recipient=ss.user,
-                sender=ss.user, # System notification
+                recipient_id=ss.user_id,
+                sender_id=ss.user_id, # System notification
                 notification_type='saved_search',
                 is_read=False
             )
@@ -73,12 +91,10 @@ def process_saved_searches():
             notifications_sent += 1
             
         # Update last check time
-        ss.last_checked_at = timezone.now()
-        ss.save()
+        ss.last_checked_at = now
+        ss.save(update_fields=['last_checked_at'])
         
-    return f"Processed {searches.count()} searches, sent {notifications_sent} notifications"
-
-from .models import CustomUser, Order
+    return f"Processed {processed} searches, sent {notifications_sent} notifications"
 
 @shared_task
 def send_missed_notification_digest(frequency='daily'):
@@ -88,27 +104,38 @@ def send_missed_notification_digest(frequency='daily'):
     else: # weekly
         since = now - timezone.timedelta(weeks=1)
         
-    users = CustomUser.objects.filter(is_active=True)
+    # Only users with something to report, found in one grouped query
+    # instead of an EXISTS per active user
+    recipient_ids = Notification.objects.filter(
+        recipient__is_active=True,
+        is_read=False,
+        created_at__gte=since
+    ).order_by().values_list('recipient_id', flat=True).distinct()
     count = 0
-    for user in users:
-        unread_notifications = Notification.objects.filter(
-            recipient=user,
-            is_read=False,
-            created_at__gte=since
-        )
-        
-        if unread_notifications.exists():
-            # In a real app, send actual email
-            # send_mail(...)
-            count += 1
+    for recipient_id in recipient_ids:
+        # In a real app, send actual email
+        # send_mail(...)
+        count += 1
             
     return f"Sent {frequency} digests to {count} users"
 
+@shared_task
+def reconcile_unread_notification_counts():
+    # Cascade deletes (posts, comments, listings) and admin edits skip the paths that
+    # keep Profile.unread_notifications_count in step, so re-derive it from the rows
+    unread = Notification.objects.filter(
+        recipient_id=OuterRef('user_id'),
+        is_read=False
+    ).order_by().values('recipient_id').annotate(count=Count('id')).values('count')
+    updated = Profile.objects.update(unread_notifications_count=Coalesce(Subquery(unread), 0))
+    return f"Reconciled unread notification counts for {updated} profiles"
+
 @shared_task
 def auto_release_escrow():
     # Automatically release funds if buyer hasn't confirmed after 7 days of shipping
     RELEASE_DAYS = 7
-    cutoff = timezone.now() - timezone.timedelta(days=RELEASE_DAYS)
+    now = timezone.now()
+    cutoff = now - timezone.timedelta(days=RELEASE_DAYS)
     
     pending_orders = Order.objects.filter(
         status='shipped',
@@ -120,8 +147,8 @@ def auto_release_escrow():
     for order in pending_orders:
         order.status = 'completed'
         order.payout_released = True
-        order.confirmed_at = timezone.now()
-        order.save()
+        order.confirmed_at = now
+        order.save(update_fields=['status', 'payout_released', 'confirmed_at', 'updated_at'])
         count += 1
         
     return f"Auto-released {count} orders"
@@ -160,39 +187,69 @@ def send_email_notification(subject, message, recipient_list):
     send_mail(
         subject,
         message,
-        settings.DEFAULT_FROM_EMAIL,
+        settings.DEFAULT_FROM_EMAIL or 'noreply@chattingus.com',
         recipient_list,
         fail_silently=False,
     )
     return f"Sent email to {recipient_list}"
 
+@shared_task
+def deliver_webhook(url, payload):
+    try:
+        requests.post(url, json=payload, timeout=3)
+    except requests.RequestException as e:
+        return f"Failed to deliver {payload['event']} to {url}: {str(e)}"
+    return f"Delivered {payload['event']} to {url}"
+
+THUMBNAIL_SIZE = (300, 300)
+EXIF_ORIENTATION = 0x0112
+
+def _is_thumbnail_ready(img):
+    # An upright RGB/greyscale JPEG within bounds can be stored as its own thumbnail
+    return (
+        img.format == 'JPEG'
+        and img.mode in ('RGB', 'L')
+        and img.width <= THUMBNAIL_SIZE[0]
+        and img.height <= THUMBNAIL_SIZE[1]
+        and img.getexif().get(EXIF_ORIENTATION, 1) == 1
+    )
+
+def _build_thumbnail(img, size=THUMBNAIL_SIZE):
+    # Convert to RGB if necessary (e.g. for PNGs with alpha)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    
+    img.thumbnail(size)
+    
+    thumb_io = BytesIO()
+    img.save(thumb_io, format='JPEG', quality=85)
+    return thumb_io
+
 @shared_task
 def process_post_media(media_id):
     try:
         media = PostMedia.objects.get(id=media_id)
         if media.media_type == 'image' and media.file:
-            # Open the image using Pillow
-            img = Image.open(media.file.path)
-            
-            # Convert to RGB if necessary (e.g. for PNGs with alpha)
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            
-            # Create a thumbnail
-            img.thumbnail((300, 300))
-            
-            # Save the thumbnail to a BytesIO object
-            thumb_io = BytesIO()
-            img.save(thumb_io, format='JPEG', quality=85)
+            # Open and orient the upload once, then build the thumbnail from the same image
+            with Image.open(media.file.path) as img:
+                if _is_thumbnail_ready(img):
+                    # Skip the decode/resize/re-encode for uploads that are already small
+                    with open(media.file.path, 'rb') as f:
+                        thumb_io = BytesIO(f.read())
+                else:
+                    # Let libjpeg decode at a reduced scale close to the thumbnail size
+                    img.draft('RGB', THUMBNAIL_SIZE)
+                    img = ImageOps.exif_transpose(img)
+                    thumb_io = _build_thumbnail(img)
             
-            # Create a ContentFile to save to the model field
+            # Hand the buffer to storage as-is rather than copying it into a ContentFile
             filename = f"thumb_{os.path.basename(media.file.name)}"
             media.thumbnail.save(
                 filename,
-                ContentFile(thumb_io.getvalue()),
+                File(thumb_io),
                 save=False
             )
-            media.save()
+            media.save(update_fields=['thumbnail'])
             return f"Processed thumbnail for media {media_id}"
     except PostMedia.DoesNotExist:
         return f"Media {media_id} not found"
@@ -1,3 +1,121 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from .models import CustomUser, Profile, Notification, Post, Listing, SellerFollow
+from .tasks import reconcile_unread_notification_counts
 
-# Create your tests here.
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class UnreadNotificationCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = CustomUser.objects.create_user(username='alice', email='alice@example.com', password='pass12345')
+        self.bob = CustomUser.objects.create_user(username='bob', email='bob@example.com', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def unread_counter(self, user):
+        return Profile.objects.get(user=user).unread_notifications_count
+
+    def notify(self, **kwargs):
+        return Notification.objects.create(recipient=self.alice, sender=self.bob, notification_type='like', **kwargs)
+
+    def test_create_increments_counter(self):
+        self.notify()
+        self.notify()
+        self.assertEqual(self.unread_counter(self.alice), 2)
+
+    def test_create_read_notification_leaves_counter(self):
+        self.notify(is_read=True)
+        self.assertEqual(self.unread_counter(self.alice), 0)
+
+    def test_mark_as_read_decrements_once(self):
+        notification = self.notify()
+        url = reverse('notification-mark-as-read', args=[notification.pk])
+        self.client.post(url)
+        self.client.post(url)
+        self.assertEqual(self.unread_counter(self.alice), 0)
+
+    def test_mark_as_read_missing_notification(self):
+        response = self.client.post(reverse('notification-mark-as-read', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_mark_all_as_read_zeroes_counter(self):
+        self.notify()
+        self.notify()
+        self.client.post(reverse('notification-mark-all-as-read'))
+        self.assertEqual(self.unread_counter(self.alice), 0)
+
+    def test_destroy_decrements_only_for_unread(self):
+        unread = self.notify()
+        read = self.notify(is_read=True)
+        self.client.delete(reverse('notification-detail', args=[read.pk]))
+        self.assertEqual(self.unread_counter(self.alice), 1)
+        self.client.delete(reverse('notification-detail', args=[unread.pk]))
+        self.assertEqual(self.unread_counter(self.alice), 0)
+
+    def test_clear_all_subtracts_unread_rows(self):
+        self.notify()
+        self.notify(is_read=True)
+        self.client.post(reverse('notification-clear-all'))
+        self.assertEqual(self.unread_counter(self.alice), 0)
+        self.assertFalse(Notification.objects.filter(recipient=self.alice).exists())
+
+    def test_counter_never_goes_below_zero(self):
+        notification = self.notify()
+        # Simulate drift, e.g. a counter already zeroed by an earlier reconcile
+        Profile.objects.filter(user=self.alice).update(unread_notifications_count=0)
+        self.client.post(reverse('notification-mark-as-read', args=[notification.pk]))
+        self.assertEqual(self.unread_counter(self.alice), 0)
+        self.notify()
+        Profile.objects.filter(user=self.alice).update(unread_notifications_count=0)
+        self.client.post(reverse('notification-mark-all-as-read'))
+        self.assertEqual(self.unread_counter(self.alice), 0)
+
+    def test_mentions_adjust_counter_once(self):
+        post = Post.objects.create(user=self.bob, caption='hello @alice and @alice again')
+        self.assertEqual(self.unread_counter(self.alice), 1)
+        # Saving again must not notify the same user twice
+        post.save()
+        self.assertEqual(self.unread_counter(self.alice), 1)
+        self.assertEqual(Notification.objects.filter(recipient=self.alice, notification_type='mention').count(), 1)
+
+    def test_self_mention_is_not_counted(self):
+        Post.objects.create(user=self.bob, caption='talking to myself @bob')
+        self.assertEqual(self.unread_counter(self.bob), 0)
+
+    def test_notify_followers_adjusts_counter(self):
+        SellerFollow.objects.create(user=self.alice, seller=self.bob)
+        Listing.objects.create(user=self.bob, title='Bike', description='Road bike', price=100, status='active')
+        self.assertEqual(self.unread_counter(self.alice), 1)
+        self.assertEqual(self.unread_counter(self.bob), 0)
+
+    def test_reconcile_repairs_drift(self):
+        self.notify()
+        self.notify(is_read=True)
+        Profile.objects.filter(user=self.alice).update(unread_notifications_count=7)
+        Profile.objects.filter(user=self.bob).update(unread_notifications_count=3)
+        reconcile_unread_notification_counts()
+        self.assertEqual(self.unread_counter(self.alice), 1)
+        self.assertEqual(self.unread_counter(self.bob), 0)
+
+    def test_unread_count_returns_counter(self):
+        self.notify()
+        self.notify()
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['unread_count'], 2)
+
+    def test_unread_count_is_invalidated_on_commit(self):
+        self.client.get(reverse('notification-unread-count'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify()
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.data['unread_count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notification-mark-all-as-read'))
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.data['unread_count'], 0)
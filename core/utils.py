@@ -1,25 +1,71 @@
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from twilio.rest import Client
-from moviepy import VideoFileClip
-from django.core.files.base import ContentFile
+from django.core.files.base import File
+import av
+import io
 import os
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+HASHTAG_RE = re.compile(r"#(\w+)")
+MENTION_RE = re.compile(r"@(\w+)")
+# Tokens longer than the backing columns (Hashtag.name, CustomUser.username) can never match a row
+MAX_HASHTAG_LENGTH = 100
+MAX_USERNAME_LENGTH = 150
+
 def extract_hashtags(text):
     if not text:
         return []
-    return list(set(re.findall(r"#(\w+)", text)))
+    return list({
+        match.group(1) for match in HASHTAG_RE.finditer(text)
+        if len(match.group(1)) <= MAX_HASHTAG_LENGTH
+    })
 
 def extract_mentions(text):
     if not text:
         return []
-    return list(set(re.findall(r"@(\w+)", text)))
+    return list({
+        match.group(1) for match in MENTION_RE.finditer(text)
+        if len(match.group(1)) <= MAX_USERNAME_LENGTH
+    })
+
+# Leading bytes of the upload -> media type, for formats identified by a fixed magic number.
+# Keys are four bytes, or three where the format only fixes three (JPEG); looked up by slice.
+MAGIC_MEDIA_TYPES = {
+    b'\xff\xd8\xff': 'image',  # JPEG
+    b'\x89PNG': 'image',
+    b'GIF8': 'image',
+    b'\x1a\x45\xdf\xa3': 'video',  # Matroska / WebM
+    b'\x00\x00\x01\xba': 'video',  # MPEG program stream
+    b'FLV\x01': 'video',
+}
+# RIFF form type -> media type
+RIFF_MEDIA_TYPES = {b'AVI ': 'video', b'WEBP': 'image'}
+# ISO base media (ftyp) brands used by still images rather than video
+IMAGE_FTYP_BRANDS = frozenset({b'heic', b'heix', b'hevc', b'mif1', b'msf1', b'avif'})
+
+def get_media_type(file):
+    header = file.read(16)
+    file.seek(0)
+    
+    if header[4:8] == b'ftyp':
+        return 'image' if header[8:12] in IMAGE_FTYP_BRANDS else 'video'
+    if header[:4] == b'RIFF':
+        media_type = RIFF_MEDIA_TYPES.get(header[8:12])
+    else:
+        media_type = MAGIC_MEDIA_TYPES.get(header[:4]) or MAGIC_MEDIA_TYPES.get(header[:3])
+    if media_type:
+        return media_type
+    
+    # Fall back to the declared content type for anything we don't sniff
+    return 'video' if (file.content_type or '').startswith('video') else 'image'
 
 def send_sms(to_number, body):
     try:
@@ -39,21 +85,30 @@ def generate_video_thumbnail(post_media):
         return
     
     try:
-        # Create thumbnail from video at 1.0s
-        clip = VideoFileClip(post_media.file.path)
-        thumbnail_path = f"thumb_{os.path.basename(post_media.file.name)}.jpg"
-        clip.save_frame(thumbnail_path, t=1.0)
-        
-        with open(thumbnail_path, 'rb') as f:
-            post_media.thumbnail.save(
-                os.path.basename(thumbnail_path),
-                ContentFile(f.read()),
-                save=True
-            )
+        # Decode the frame at 1.0s in-process instead of shelling out to ffmpeg
+        with av.open(post_media.file.path) as container:
+            stream = container.streams.video[0]
+            # Slice threading uses every core without frame threading's pipeline delay
+            stream.thread_type = 'SLICE'
+            stream.thread_count = 0
+            # Jump to the keyframe before 1.0s, then decode forward to the exact frame
+            target = (stream.start_time or 0) + int(1.0 / stream.time_base)
+            container.seek(target, stream=stream)
+            frame = None
+            for frame in container.decode(stream):
+                if frame.pts is None or frame.pts >= target:
+                    break
+            if frame is None:
+                return
+            thumb_io = io.BytesIO()
+            frame.to_image().save(thumb_io, format='JPEG', quality=85)
         
-        # Cleanup temp file
-        os.remove(thumbnail_path)
-        clip.close()
+        post_media.thumbnail.save(
+            f"thumb_{os.path.splitext(os.path.basename(post_media.file.name))[0]}.jpg",
+            File(thumb_io),
+            save=False
+        )
+        post_media.save(update_fields=['thumbnail'])
     except Exception as e:
         logger.error(f"Error generating thumbnail: {e}")
 
@@ -74,12 +129,22 @@ def send_verification_email(user):
         [user.email]
     )
     email.attach_alternative(html_content, "text/html")
-    email.attach_alternative(html_content, "text/html")
     email.send()
 
+NOTIFICATION_DEDUP_SECONDS = 60
+
 def send_notification(recipient, sender, notification_type, post=None, comment=None, listing=None, priority='normal'):
     from .models import Notification, NotificationSetting
     
+    # Drop repeats of the same event (e.g. like/unlike/like on one post) within a
+    # short window before touching the database or any delivery channel
+    target_ids = ':'.join(str(obj.id) if obj else '0' for obj in (post, comment, listing))
+    dedup_key = f"notif:{recipient.id}:{sender.id}:{notification_type}:{target_ids}"
+    if cache.get(dedup_key):
+        return
+    # Claimed on commit, so a rolled-back caller does not suppress its retry
+    transaction.on_commit(lambda: cache.set(dedup_key, 1, timeout=NOTIFICATION_DEDUP_SECONDS))
+    
     # Get settings for this type
     setting, created = NotificationSetting.objects.get_or_create(
         user=recipient,
@@ -5,14 +5,22 @@ import random
 import uuid
 from decimal import Decimal
 from django.utils import timezone
-from .models import CustomUser, UserEmailVerification, SMSDevice, Post, PostMedia, Like, Comment, Hashtag, Follow, Notification, Block, Mute, FeedPost, SavedCollection, SavedItem, Story, StoryView, StoryReaction, Highlight, HighlightItem, Category, Listing, AttributeDefinition, ListingAttributeValue, ListingPromotion, SavedSearch, Conversation, Message, Offer, Report, Order, Dispute, DisputeMessage, Review, WishlistItem, SellerFollow, ListingView
-from .utils import send_verification_email, send_sms, send_notification
+from .models import CustomUser, UserEmailVerification, SMSDevice, Post, PostMedia, Like, Comment, Hashtag, Follow, Notification, Block, Mute, FeedPost, SavedCollection, SavedItem, Story, StoryView, StoryReaction, Highlight, HighlightItem, Category, Listing, AttributeDefinition, ListingAttributeValue, ListingPromotion, SavedSearch, Conversation, Message, MessageReaction, Offer, Report, Order, Dispute, DisputeMessage, Review, WishlistItem, SellerFollow, ListingView
+from .utils import send_verification_email, send_sms, send_notification, get_media_type
 from django_otp.plugins.otp_static.models import StaticDevice, StaticToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+import orjson
+from .renderers import ORJSONRenderer
+from .pagination import CommentCursorPagination
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.db.models import Q, F, Count, Sum, Exists, OuterRef, Subquery, Prefetch
+from django.db.models.functions import TruncMonth
 from django.contrib.auth import get_user_model
 from .throttles import AuthRateThrottle, PostRateThrottle, MarketplaceRateThrottle, VerifiedUserRateThrottle
 from .serializers import (
@@ -41,8 +49,7 @@ from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
-from django.core.mail import send_mail
-from django.conf import settings
+from .tasks import send_email_notification
 
 User = get_user_model()
 
@@ -103,12 +110,10 @@ class PasswordResetRequestView(APIView):
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         reset_url = f"http://localhost:3000/reset-password/{uid}/{token}/"  # Placeholder UI URL
         
-        send_mail(
+        send_email_notification.delay(
             'Password Reset Request',
             f'Click the link to reset your password: {reset_url}',
-            settings.DEFAULT_FROM_EMAIL or 'noreply@chattingus.com',
-            [email],
-            fail_silently=False,
+            [email]
         )
         return Response({'message': 'If an account exists with this email, a reset link has been sent.'}, status=status.HTTP_200_OK)
 
@@ -217,9 +222,10 @@ class VerifySMSView(APIView):
                 # Generate static backup codes if they don't exist
                 static_device, created = StaticDevice.objects.get_or_create(user=user, name='backup-codes')
                 if created:
-                    for _ in range(10):
-                        token = str(random.randint(10000000, 99999999))
-                        StaticToken.objects.create(device=static_device, token=token)
+                    StaticToken.objects.bulk_create([
+                        StaticToken(device=static_device, token=str(random.randint(10000000, 99999999)))
+                        for _ in range(10)
+                    ])
                 
                 return Response({'message': '2FA enabled successfully.'}, status=status.HTTP_200_OK)
             return Response({'error': 'Invalid or expired code.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -252,6 +258,18 @@ class StaticBackupCodesView(APIView):
         except StaticDevice.DoesNotExist:
             return Response({'error': 'No backup codes found.'}, status=status.HTTP_400_BAD_REQUEST)
 
+VALID_REACTIONS = tuple(choice[0] for choice in Like.REACTION_CHOICES)
+INVALID_REACTION_ERROR = f'Invalid reaction type. Choose from: {", ".join(VALID_REACTIONS)}'
+
+# Reply levels loaded up front for the nested CommentSerializer; deeper threads fall back to a query per comment
+COMMENT_REPLY_PREFETCH_DEPTH = 3
+
+def comment_replies_prefetch(depth=COMMENT_REPLY_PREFETCH_DEPTH):
+    queryset = Comment.objects.select_related('user__profile').prefetch_related('mentions', 'hashtags')
+    if depth > 1:
+        queryset = queryset.prefetch_related(comment_replies_prefetch(depth - 1))
+    return Prefetch('replies', queryset=queryset)
+
 class PostViewSet(viewsets.ModelViewSet):
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -266,7 +284,8 @@ class PostViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Post.objects.all().order_by('-created_at')
+        # The tsvector is only used for filtering, never serialized
+        queryset = Post.objects.defer('search_vector').order_by('-created_at')
         
         # Search query
         search_query = self.request.query_params.get('search')
@@ -291,13 +310,11 @@ class PostViewSet(viewsets.ModelViewSet):
         # Handle media files if any
         files = self.request.FILES.getlist('media_files')
         for i, file in enumerate(files):
-            # Simple detection of media type
-            media_type = 'video' if file.content_type.startswith('video') else 'image'
             PostMedia.objects.create(
                 post=post,
                 file=file,
                 order=i,
-                media_type=media_type
+                media_type=get_media_type(file)
             )
         
         # Tags are handled by TaggitSerializer automaticaly if present in data
@@ -307,10 +324,8 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         reaction_type = request.data.get('reaction_type', 'like')
         
-        valid_reactions = [choice[0] for choice in Like.REACTION_CHOICES]
-        if reaction_type not in valid_reactions:
-            return Response({'error': f'Invalid reaction type. Choose from: {", ".join(valid_reactions)}'}, 
-                            status=status.HTTP_400_BAD_REQUEST)
+        if reaction_type not in VALID_REACTIONS:
+            return Response({'error': INVALID_REACTION_ERROR}, status=status.HTTP_400_BAD_REQUEST)
             
         like, created = Like.objects.get_or_create(
             user=request.user, 
@@ -342,9 +357,16 @@ class PostViewSet(viewsets.ModelViewSet):
     def comments(self, request, pk=None):
         post = self.get_object()
         # Fetch only top-level comments; replies are nested via serializer
-        comments = post.comments.filter(parent=None).order_by('-created_at')
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        comments = post.comments.filter(parent=None).select_related('user__profile').prefetch_related(
+            'mentions',
+            'hashtags',
+            comment_replies_prefetch()
+        )
+        # Page through with the same created_at cursor as the comments endpoint
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def save(self, request, pk=None):
@@ -406,6 +428,7 @@ class HashtagViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = HashtagSerializer
 
     @action(detail=False, methods=['get'])
+    @method_decorator(cache_page(60)) # Same for every user; short so counts stay current, ETag covers repeats
     def trending(self, request):
         trending_tags = self.queryset.filter(count__gt=0)[:10]
         serializer = self.get_serializer(trending_tags, many=True)
@@ -414,19 +437,31 @@ class HashtagViewSet(viewsets.ReadOnlyModelViewSet):
 class CommentViewSet(viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         queryset = Comment.objects.all()
+        if self.action in ('list', 'retrieve'):
+            # Load authors, tags, mentions and the first reply levels with them for the nested serializer.
+            # Writes look the row up alone; update clears the prefetch before rendering anyway.
+            queryset = queryset.select_related('user__profile').prefetch_related(
+                'mentions',
+                'hashtags',
+                comment_replies_prefetch()
+            )
         if user.is_authenticated:
             blocked_users = Block.objects.filter(user=user).values_list('blocked_user', flat=True)
             blocked_by_users = Block.objects.filter(blocked_user=user).values_list('user', flat=True)
             queryset = queryset.exclude(user__in=blocked_users).exclude(user__in=blocked_by_users)
         return queryset
 
+    # The comment, its hashtag/mention rows (post_save) and the author notification commit together
+    @transaction.atomic
     def perform_create(self, serializer):
         comment = serializer.save(user=self.request.user)
-        if comment.post.user != self.request.user:
+        # Compare the raw FK so commenting on your own post never loads the author row
+        if comment.post.user_id != self.request.user.id:
             send_notification(
                 recipient=comment.post.user,
                 sender=self.request.user,
@@ -442,14 +477,17 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         user_id = kwargs.get('pk')
-        cache_key = f'user_profile_{user_id}'
-        cached_data = cache.get(cache_key)
+        # Cache the encoded JSON so hits skip both the serializer and the renderer
+        cache_key = f'user_profile_json_{user_id}'
+        cached_json = cache.get(cache_key)
         
-        if cached_data:
-            return Response(cached_data)
+        if cached_json:
+            if request.accepted_renderer.format == 'json':
+                return HttpResponse(cached_json, content_type='application/json')
+            return Response(orjson.loads(cached_json))
         
         response = super().retrieve(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=3600) # 1 hour
+        cache.set(cache_key, ORJSONRenderer().render(response.data), timeout=3600) # 1 hour
         return response
 
     @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
@@ -458,7 +496,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         # Generate mock Stripe Connect link
         account_id = f"acct_{random.getrandbits(32)}"
         user.profile.stripe_account_id = account_id
-        user.profile.save()
+        user.profile.save(update_fields=['stripe_account_id', 'last_active'])
         return Response({
             'stripe_url': f"https://connect.stripe.com/express/oauth/authorize?client_id=ca_123&state={account_id}",
             'account_id': account_id
@@ -468,7 +506,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     def stripe_callback(self, request):
         user = request.user
         user.profile.is_onboarded = True
-        user.profile.save()
+        user.profile.save(update_fields=['is_onboarded', 'last_active'])
         return Response({'status': 'seller onboarded'})
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
@@ -535,7 +573,6 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def suggested(self, request):
-        from django.db.models import Count
         user = request.user
         my_following = Follow.objects.filter(follower=user, status='accepted').values_list('followed_id', flat=True)
         blocked_ids = Block.objects.filter(user=user).values_list('blocked_user_id', flat=True)
@@ -620,7 +657,7 @@ class FollowViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Not authorized.'}, status=status.HTTP_403_FORBIDDEN)
         
         follow.status = 'accepted'
-        follow.save()
+        follow.save(update_fields=['status'])
         
         Notification.objects.create(
             recipient=follow.follower,
@@ -636,7 +673,7 @@ class FollowViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Not authorized.'}, status=status.HTTP_403_FORBIDDEN)
         
         follow.status = 'rejected'
-        follow.save()
+        follow.save(update_fields=['status'])
         return Response({'status': 'rejected'})
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -644,23 +681,61 @@ class NotificationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(recipient=self.request.user)
+        # The serializer nests the sender with its profile; join both instead of querying per row
+        return Notification.objects.filter(recipient=self.request.user).select_related('sender__profile')
 
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
-        notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        # One narrow UPDATE instead of loading the row and rewriting every column
+        notifications = Notification.objects.filter(pk=pk, recipient=request.user)
+        if notifications.filter(is_read=False).update(is_read=True):
+            Profile.adjust_unread_notifications([request.user.id], -1)
+            Notification.invalidate_unread_counts([request.user.id])
+        elif not notifications.exists():
+            return Response({'error': 'Notification not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'status': 'marked as read'})
 
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        # Served from cache; signals and the bulk paths below drop the key on every write
+        cache_key = Notification.unread_count_cache_key(request.user.id)
+        count = cache.get(cache_key)
+        if count is None:
+            # A single-row read of the maintained counter rather than a COUNT over unread rows
+            count = Profile.objects.filter(user=request.user).values_list('unread_notifications_count', flat=True).first() or 0
+            cache.set(cache_key, count, timeout=3600)
+        response = Response({'unread_count': count})
+        # Let clients reuse the badge for a few seconds; ConditionalGetMiddleware adds the ETag/304
+        patch_cache_control(response, private=True, max_age=10)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
-        self.get_queryset().update(is_read=True)
+        updated = Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+        Profile.adjust_unread_notifications([request.user.id], -updated)
+        # Drop rather than store 0: a notification created meanwhile must not be masked
+        Notification.invalidate_unread_counts([request.user.id])
         return Response({'status': 'all marked as read'})
 
+    def perform_update(self, serializer):
+        was_read = serializer.instance.is_read
+        notification = serializer.save()
+        if notification.is_read != was_read:
+            Profile.adjust_unread_notifications([notification.recipient_id], 1 if was_read else -1)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        if not instance.is_read:
+            Profile.adjust_unread_notifications([instance.recipient_id], -1)
+        Notification.invalidate_unread_counts([instance.recipient_id])
+
     @action(detail=False, methods=['post'])
     def clear_all(self, request):
+        unread_deleted, _ = self.get_queryset().filter(is_read=False).delete()
         self.get_queryset().delete()
+        Profile.adjust_unread_notifications([request.user.id], -unread_deleted)
+        Notification.invalidate_unread_counts([request.user.id])
         return Response({'status': 'all notifications cleared'})
 
 class NotificationSettingViewSet(viewsets.ModelViewSet):
@@ -696,7 +771,17 @@ class StoryViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Only show active stories (non-expired)
-        return Story.objects.filter(expires_at__gt=timezone.now()).order_by('-created_at')
+        queryset = Story.objects.filter(expires_at__gt=timezone.now()).select_related('user__profile').order_by('-created_at')
+        user = self.request.user
+        if user.is_authenticated:
+            # Resolve "seen by me" and "my reaction" in the list query instead of a lookup per story
+            queryset = queryset.annotate(
+                is_viewed=Exists(StoryView.objects.filter(story=OuterRef('pk'), user=user)),
+                user_reaction=Subquery(
+                    StoryReaction.objects.filter(story=OuterRef('pk'), user=user).values('emoji')[:1]
+                )
+            )
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -814,7 +899,8 @@ class ListingViewSet(viewsets.ModelViewSet):
     throttle_classes = [MarketplaceRateThrottle, VerifiedUserRateThrottle]
 
     def get_queryset(self):
-        queryset = Listing.objects.all()
+        # The tsvector is only used for filtering, never serialized
+        queryset = Listing.objects.defer('search_vector')
         
         # Search query
         search_query = self.request.query_params.get('search')
@@ -828,7 +914,6 @@ class ListingViewSet(viewsets.ModelViewSet):
         # Base filtering
         if self.request.user.is_authenticated:
             # Authors can see their own content, others only see active
-            from django.db.models import Q
             queryset = queryset.filter(Q(status='active') | Q(user=self.request.user))
         else:
             queryset = queryset.filter(status='active')
@@ -849,7 +934,6 @@ class ListingViewSet(viewsets.ModelViewSet):
 
         # Order by active promotions (Featured first, then Urgent)
         now = timezone.now()
-        from django.db.models import Exists, OuterRef
         
         featured_exists = ListingPromotion.objects.filter(
             listing=OuterRef('pk'),
@@ -894,7 +978,7 @@ class ListingViewSet(viewsets.ModelViewSet):
         listing.expires_at = timezone.now() + timezone.timedelta(days=30)
         if listing.status == 'expired':
             listing.status = 'active'
-        listing.save()
+        listing.save(update_fields=['expires_at', 'status', 'updated_at'])
         
         return Response({'status': 'renewed', 'expires_at': listing.expires_at})
 
@@ -928,9 +1012,8 @@ class ListingViewSet(viewsets.ModelViewSet):
             text=message_text
         )
 
-        # Track contact click
-        listing.contact_clicks += 1
-        listing.save()
+        # Track contact click atomically without rewriting (and re-signalling) the whole listing
+        Listing.objects.filter(pk=listing.pk).update(contact_clicks=F('contact_clicks') + 1)
 
         return Response({
             'status': 'conversation started',
@@ -975,7 +1058,22 @@ class ConversationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.request.user.conversations.all().order_by('-updated_at')
+        queryset = self.request.user.conversations.order_by('-updated_at')
+        if self.action in ('list', 'retrieve'):
+            # Participants and admins are serialized in full, profile included, for every conversation.
+            # The latest message comes from one windowed query for the whole page instead of one per conversation.
+            queryset = queryset.prefetch_related(
+                Prefetch('participants', queryset=CustomUser.objects.select_related('profile')),
+                Prefetch('admins', queryset=CustomUser.objects.select_related('profile')),
+                Prefetch(
+                    'messages',
+                    queryset=Message.objects.select_related('sender__profile').prefetch_related(
+                        Prefetch('reactions', queryset=MessageReaction.objects.select_related('user__profile'))
+                    ).order_by('-created_at', '-id')[:1],
+                    to_attr='latest_messages'
+                )
+            )
+        return queryset
 
     def perform_create(self, serializer):
         conversation = serializer.save()
@@ -1049,15 +1147,16 @@ class MessageViewSet(viewsets.ModelViewSet):
         if not conversation.participants.filter(id=sender.id).exists():
             raise permissions.PermissionDenied("You are not a participant in this conversation.")
             
-        participants = conversation.participants.all()
+        other_ids = conversation.participants.exclude(id=sender.id).values('id')
         
-        # Check if any other participant has blocked the sender or vice versa
-        for participant in participants:
-            if participant != sender:
-                if Block.objects.filter(user=sender, blocked_user=participant).exists():
-                    raise permissions.PermissionDenied("You have blocked a participant in this conversation.")
-                if Block.objects.filter(user=participant, blocked_user=sender).exists():
-                    raise permissions.PermissionDenied("A participant in this conversation has blocked you.")
+        # Check if any other participant has blocked the sender or vice versa, in one query
+        blocker_ids = set(Block.objects.filter(
+            Q(user=sender, blocked_user__in=other_ids) | Q(user__in=other_ids, blocked_user=sender)
+        ).values_list('user_id', flat=True))
+        if sender.id in blocker_ids:
+            raise permissions.PermissionDenied("You have blocked a participant in this conversation.")
+        if blocker_ids:
+            raise permissions.PermissionDenied("A participant in this conversation has blocked you.")
         
         serializer.save(sender=sender)
 
@@ -1113,7 +1212,7 @@ class OfferViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only the seller can accept offers'}, status=status.HTTP_403_FORBIDDEN)
         
         offer.status = 'accepted'
-        offer.save()
+        offer.save(update_fields=['status', 'updated_at'])
         
         # Mark listing as sold? Depending on business logic. 
         # For now, just mark the offer.
@@ -1126,7 +1225,7 @@ class OfferViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Only the seller can reject offers'}, status=status.HTTP_403_FORBIDDEN)
         
         offer.status = 'rejected'
-        offer.save()
+        offer.save(update_fields=['status', 'updated_at'])
         return Response({'status': 'offer rejected'})
 
     @action(detail=True, methods=['post'])
@@ -1141,7 +1240,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         
         offer.status = 'countered'
         offer.countered_amount = amount
-        offer.save()
+        offer.save(update_fields=['status', 'countered_amount', 'updated_at'])
         return Response({'status': 'counter-offer sent', 'amount': amount})
 
 class ReportViewSet(viewsets.ModelViewSet):
@@ -1208,7 +1307,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         order.status = 'completed'
         order.confirmed_at = timezone.now()
         order.payout_released = True
-        order.save()
+        order.save(update_fields=['status', 'confirmed_at', 'payout_released', 'updated_at'])
         return Response({'status': 'order completed, payment released to seller'})
 
 class DisputeViewSet(viewsets.ModelViewSet):
@@ -1318,11 +1417,7 @@ class DashboardViewSet(viewsets.ViewSet):
         user = request.user
         
         # 1. Revenue Chart (Daily for the last 30 days)
-        from django_celery_beat.models import PeriodicTask # used for jobs status later
-        from django.db.models import Sum, Count
-        from datetime import timedelta
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
+        thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
         revenue_data = Order.objects.filter(
             seller=user, 
             status='completed',
@@ -1363,28 +1458,24 @@ class DashboardViewSet(viewsets.ViewSet):
     def update_layout(self, request):
         layout = request.data.get('layout')
         if layout:
-            profile = request.user.profile
-            profile.dashboard_layout = layout
-            profile.save()
+            # Write just the layout column instead of loading and re-saving the whole profile row
+            Profile.objects.filter(user=request.user).update(dashboard_layout=layout, last_active=timezone.now())
             return Response({'status': 'success'})
         return Response({'error': 'Layout missing'}, status=400)
 
     @action(detail=False, methods=['get'])
     def seller_stats(self, request):
         user = request.user
-        listings = Listing.objects.filter(user=user)
         
         total_views = ListingView.objects.filter(listing__user=user).count()
-        total_clicks = sum(l.contact_clicks for l in listings)
+        # Summed in the database rather than loading every listing row for one column
+        total_clicks = Listing.objects.filter(user=user).aggregate(total=Sum('contact_clicks'))['total'] or 0
         
         orders = Order.objects.filter(seller=user)
         total_sales = orders.count()
         
         conversion_rate = (total_sales / total_views * 100) if total_views > 0 else 0
         
-        from django.db.models.functions import TruncMonth
-        from django.db.models import Sum
-        
         revenue_data = Order.objects.filter(seller=user, status='completed') \
             .annotate(month=TruncMonth('created_at')) \
             .values('month') \
@@ -1404,6 +1495,10 @@ class SubscriptionPlanViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = SubscriptionPlanSerializer
     permission_classes = [permissions.AllowAny]
 
+    @method_decorator(cache_page(60)) # Short so admin price/status edits show within a minute; ETag covers repeats
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 class UserSubscriptionViewSet(viewsets.ModelViewSet):
     serializer_class = UserSubscriptionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -1430,7 +1525,6 @@ class WalletViewSet(viewsets.ReadOnlyModelViewSet):
             return Response({'error': 'Invalid amount'}, status=400)
         
         # mock stripe payment
-        import uuid
         VirtualTransaction.objects.create(
             wallet=wallet,
             amount=amount,
@@ -1458,5 +1552,4 @@ class ReferralViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        from django.db.models import Q
         return Referral.objects.filter(Q(referrer=self.request.user) | Q(referred_user=self.request.user))